@@ -9,41 +9,44 @@ class CADataCenter(DataCenter):
     This class represents the properties of Zoho CRM in the Canada (CA) domain.
     """
 
+    _IAM_URL = "https://accounts.zohocloud.ca/oauth/v2/token"
+    _FILE_UPLOAD_URL = "https://content.zohoapis.com"
+
+    # Environment objects are constants, built once per API URL
+    _environments = {}
+
+    @classmethod
+    def _get_environment(cls, url):
+        """
+        Return the cached Environment for the given API URL.
+        """
+        if url not in cls._environments:
+            cls._environments[url] = DataCenter.Environment(url, cls._IAM_URL, cls._FILE_UPLOAD_URL)
+        return cls._environments[url]
+
     @classmethod
     def PRODUCTION(cls):
         """
         Zoho CRM Production environment in Canada domain.
         """
-        return DataCenter.Environment(
-            "https://www.zohoapis.ca",
-            cls().get_iam_url(),
-            cls().get_file_upload_url()
-        )
+        return cls._get_environment("https://www.zohoapis.ca")
 
     @classmethod
     def SANDBOX(cls):
         """
         Zoho CRM Sandbox environment in Canada domain.
         """
-        return DataCenter.Environment(
-            "https://sandbox.zohoapis.ca",
-            cls().get_iam_url(),
-            cls().get_file_upload_url()
-        )
+        return cls._get_environment("https://sandbox.zohoapis.ca")
 
     @classmethod
     def DEVELOPER(cls):
         """
         Zoho CRM Developer environment in Canada domain.
         """
-        return DataCenter.Environment(
-            "https://developer.zohoapis.ca",
-            cls().get_iam_url(),
-            cls().get_file_upload_url()
-        )
+        return cls._get_environment("https://developer.zohoapis.ca")
 
     def get_iam_url(self):
-        return "https://accounts.zohocloud.ca/oauth/v2/token"
+        return self._IAM_URL
 
     def get_file_upload_url(self):
-        return "https://content.zohoapis.com"
+        return self._FILE_UPLOAD_URL
@@ -1,65 +1,183 @@
 import os
+import fcntl
+import hashlib
+import tempfile
+import time
+import orjson
 from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from fastapi.staticfiles import StaticFiles
 from fastapi import Request
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
 from contextlib import asynccontextmanager
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, EmailStr, Field
 import asyncio
 from dotenv import load_dotenv
 
-from sync_leads import sync_leads
-from mail_service import MailService
-
-# Load environment variables
+# Load environment variables before importing modules that read them at import time
 load_dotenv()
 
+from sync_leads import async_sync_leads, run_blocking, SYNC_EXECUTOR
+from initialize_sdk import get_sdk_instance
+from mail_service import get_mail_service
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize scheduler
-scheduler = BackgroundScheduler()
+# Initialize scheduler; it attaches to the running event loop when started in lifespan
+scheduler = AsyncIOScheduler()
+
+# Lock file used to elect a single scheduler owner across uvicorn workers
+SCHEDULER_LOCK_FILE = os.getenv(
+    'SCHEDULER_LOCK_FILE',
+    os.path.join(tempfile.gettempdir(), 'zoho_sync_scheduler.lock')
+)
+_scheduler_lock = None
+
+# The scheduler owner publishes its state here so every worker reports the same status
+SCHEDULER_STATE_FILE = os.getenv(
+    'SCHEDULER_STATE_FILE',
+    os.path.join(tempfile.gettempdir(), 'zoho_sync_scheduler.json')
+)
+# Set in lifespan when this worker owns the scheduler
+_scheduler_owner = False
+
+def _should_run_scheduler() -> bool:
+    """Return True if this worker process should own the cron scheduler"""
+    global _scheduler_lock
+    if os.getenv('RUN_SCHEDULER', 'true').lower() not in ('1', 'true', 'yes'):
+        return False
+    
+    # Only the first worker to grab the lock runs the scheduler; the lock is
+    # released by the OS when that process exits
+    lock_file = open(SCHEDULER_LOCK_FILE, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _scheduler_lock = lock_file
+    return True
+
+def _local_scheduler_status() -> Dict[str, Any]:
+    """Scheduler state and jobs of this worker process"""
+    return {
+        "scheduler_running": scheduler.running,
+        "jobs": [
+            {
+                "id": job.id,
+                "name": job.name,
+                "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
+                "trigger": str(job.trigger)
+            }
+            for job in scheduler.get_jobs()
+        ]
+    }
+
+def _publish_scheduler_status(event=None) -> None:
+    """Write the owner's scheduler state for the other workers; called on start and after each run"""
+    state = {"pid": os.getpid(), **_local_scheduler_status()}
+    # Write then rename so readers never see a partial file
+    tmp_file = f"{SCHEDULER_STATE_FILE}.{os.getpid()}"
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(state))
+        os.replace(tmp_file, SCHEDULER_STATE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not publish scheduler state: {e}")
+
+def _scheduler_status() -> Dict[str, Any]:
+    """Scheduler state and jobs of whichever worker owns the scheduler"""
+    if _scheduler_owner:
+        return _local_scheduler_status()
+    
+    try:
+        with open(SCHEDULER_STATE_FILE, 'rb') as f:
+            state = orjson.loads(f.read())
+        # Raises if the owner has exited and left a stale state file behind
+        os.kill(state.pop("pid"), 0)
+        return state
+    except (OSError, ValueError, KeyError):
+        return {"scheduler_running": False, "jobs": []}
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up the application...")
     
-    # Start the scheduler
-    scheduler.start()
+    # Initialize the Zoho SDK once up front instead of on the first sync
+    try:
+        await run_blocking(get_sdk_instance)
+    except Exception as e:
+        logger.error(f"Zoho SDK initialization failed, will retry on first sync: {e}")
     
-    # Schedule lead sync to run daily at 2 AM
-    scheduler.add_job(
-        func=sync_leads_job,
-        trigger=CronTrigger(hour=2, minute=0),  # Run daily at 2 AM
-        id='sync_leads_daily',
-        name='Sync leads from Zoho CRM daily',
-        replace_existing=True
-    )
+    # Compile the dashboard template before the first request
+    templates.get_template("index.html")
     
-    logger.info("Scheduler started and jobs configured")
+    global _scheduler_owner
+    if _should_run_scheduler():
+        _scheduler_owner = True
+        
+        # Start the scheduler
+        scheduler.start()
+        
+        # Schedule lead sync to run daily at 2 AM
+        scheduler.add_job(
+            func=sync_leads_job,
+            trigger=CronTrigger(hour=2, minute=0),  # Run daily at 2 AM
+            id='sync_leads_daily',
+            name='Sync leads from Zoho CRM daily',
+            replace_existing=True,
+            max_instances=1,  # Never overlap a slow sync with the next run
+            coalesce=True,  # Collapse missed runs into a single run
+            misfire_grace_time=3600  # Still run if the trigger is up to an hour late
+        )
+        
+        # Republish after every run, when the job's next run time moves on
+        scheduler.add_listener(_publish_scheduler_status, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
+        _publish_scheduler_status()
+        
+        logger.info("Scheduler started and jobs configured")
+    else:
+        logger.info(f"Scheduler not started in worker {os.getpid()}")
     
     yield
     
     # Shutdown
     logger.info("Shutting down the application...")
-    scheduler.shutdown()
+    if scheduler.running:
+        scheduler.shutdown()
+    if _scheduler_owner:
+        try:
+            os.remove(SCHEDULER_STATE_FILE)
+        except OSError:
+            pass
+    await mail_service.close()
+    SYNC_EXECUTOR.shutdown(wait=False)
 
 app = FastAPI(
     title="Zoho CRM Lead Sync Application",
     description="A web application to sync leads from Zoho CRM and send emails",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Templates and static files
-templates = Jinja2Templates(directory="templates")
+# Templates and static files; templates are not re-checked on disk and compiled
+# bytecode is cached across worker processes
+templates = Jinja2Templates(
+    directory="templates",
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache()
+)
 
 # Create templates directory if it doesn't exist
 os.makedirs("templates", exist_ok=True)
@@ -71,17 +189,40 @@ except Exception as e:
     logger.warning(f"Could not mount static files: {e}")
 
 # Initialize mail service
-mail_service = MailService()
+mail_service = get_mail_service()
 
-def sync_leads_job():
+async def sync_leads_job():
     """Background job to sync leads"""
     try:
         logger.info("Starting scheduled lead sync...")
-        result = sync_leads()
+        result = await async_sync_leads()
         logger.info(f"Lead sync completed successfully: {result}")
     except Exception as e:
         logger.error(f"Error during scheduled lead sync: {e}")
 
+# (epoch seconds, isoformat) of the last timestamp handed out by _now_iso
+_now_cache = (0.0, "")
+
+def _now_iso() -> str:
+    """Return the current local time as ISO 8601, recomputed at most once per second"""
+    global _now_cache
+    now = time.time()
+    if now - _now_cache[0] >= 1.0:
+        _now_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return _now_cache[1]
+
+def _cached_json_response(request: Request, payload: Dict[str, Any]) -> Response:
+    """Return payload with an ETag of its serialized body, or 304 if the client already has it"""
+    response = ORJSONResponse(payload)
+    etag = '"' + hashlib.blake2b(response.body, digest_size=16).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=5"}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return response
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page"""
@@ -91,47 +232,37 @@ async def home(request: Request):
 async def manual_sync_leads(background_tasks: BackgroundTasks):
     """Manually trigger lead synchronization"""
     try:
-        background_tasks.add_task(sync_leads)
+        # Runs on the event loop after the response; blocking steps use SYNC_EXECUTOR
+        background_tasks.add_task(async_sync_leads)
         return {"message": "Lead synchronization started in background"}
     except Exception as e:
         logger.error(f"Error starting manual sync: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/sync-status")
-async def get_sync_status():
+async def get_sync_status(request: Request):
     """Get the status of scheduled jobs"""
-    jobs = []
-    for job in scheduler.get_jobs():
-        jobs.append({
-            "id": job.id,
-            "name": job.name,
-            "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
-            "trigger": str(job.trigger)
-        })
-    
-    return {
-        "scheduler_running": scheduler.running,
-        "jobs": jobs,
-        "current_time": datetime.now().isoformat()
-    }
+    return _cached_json_response(request, {
+        **_scheduler_status(),
+        "current_time": _now_iso()
+    })
+
+class SendEmailRequest(BaseModel):
+    """Request body for /send-email"""
+    email: EmailStr
+    subject: Optional[str] = None
+    template_name: str = "default"
+    template_data: Dict[str, Any] = Field(default_factory=dict)
 
 @app.post("/send-email")
-async def send_email(
-    email: str,
-    subject: str,
-    template_name: str = "default",
-    template_data: Dict[str, Any] = None
-):
+async def send_email(email_request: SendEmailRequest):
     """Send email using SendGrid"""
     try:
-        if template_data is None:
-            template_data = {}
-        
         success = await mail_service.send_mail(
-            to_email=email,
-            subject=subject,
-            template_name=template_name,
-            template_data=template_data
+            to_email=email_request.email,
+            subject=email_request.subject,
+            template_name=email_request.template_name,
+            template_data=email_request.template_data
         )
         
         if success:
@@ -144,14 +275,21 @@ async def send_email(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
-    return {
+    return _cached_json_response(request, {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "scheduler_running": scheduler.running
-    }
+        "timestamp": _now_iso(),
+        "scheduler_running": _scheduler_status()["scheduler_running"]
+    })
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv('WEB_CONCURRENCY', '4')),
+        loop="uvloop",
+        http="httptools"
+    )
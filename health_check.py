@@ -4,15 +4,17 @@
 Health check script for the running application
 """
 
-import requests
-import json
+import httpx
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
-def check_health():
+BASE_URL = "http://localhost:8000"
+
+def check_health(response_future: Future):
     """Check application health"""
     try:
-        response = requests.get("http://localhost:8000/health", timeout=10)
+        response = response_future.result()
         
         if response.status_code == 200:
             data = response.json()
@@ -25,7 +27,7 @@ def check_health():
             print(f"❌ Health check failed: HTTP {response.status_code}")
             return False
             
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ Cannot connect to application (is it running?)")
         print("💡 Start the application with: ./start.sh")
         return False
@@ -33,10 +35,10 @@ def check_health():
         print(f"❌ Health check error: {e}")
         return False
 
-def check_sync_status():
+def check_sync_status(response_future: Future):
     """Check sync status"""
     try:
-        response = requests.get("http://localhost:8000/sync-status", timeout=10)
+        response = response_future.result()
         
         if response.status_code == 200:
             data = response.json()
@@ -71,12 +73,17 @@ def main():
     print("🏥 Application Health Check")
     print("=" * 30)
     
-    health_ok = check_health()
+    # Issue both probes concurrently over one pooled client
+    with httpx.Client(base_url=BASE_URL, timeout=10) as client:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            health_future = executor.submit(client.get, "/health")
+            sync_future = executor.submit(client.get, "/sync-status")
+            
+            health_ok = check_health(health_future)
+            sync_ok = check_sync_status(sync_future) if health_ok else False
     
     if health_ok:
-        sync_ok = check_sync_status()
-        
-        if health_ok and sync_ok:
+        if sync_ok:
             print("\n🎉 All systems operational!")
             print("🌐 Dashboard: http://localhost:8000")
             sys.exit(0)
@@ -7,48 +7,60 @@ from zcrmsdk.src.com.zoho.api.authenticator.oauth_token import OAuthToken, Token
 from zcrmsdk.src.com.zoho.crm.api.sdk_config import SDKConfig
 from CADataCenter import CADataCenter
 import os
+import logging
+import threading
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
 
-load_dotenv()
+
+# app.py loads .env before importing this module; only read it here when used standalone
+if not os.getenv('ZOHO_CLIENT_ID'):
+    load_dotenv()
+
+# Zoho credentials are read once at import
+ZOHO_USER_EMAIL = os.getenv('ZOHO_USER_EMAIL')
+ZOHO_CLIENT_ID = os.getenv('ZOHO_CLIENT_ID')
+ZOHO_CLIENT_SECRET = os.getenv('ZOHO_CLIENT_SECRET')
+ZOHO_REFRESH_TOKEN = os.getenv('ZOHO_REFRESH_TOKEN')
+ZOHO_REDIRECT_URL = os.getenv('ZOHO_REDIRECT_URL')
 
 class ZohoSDKInitializer:
     _instance = None
     _initialized = False
+    _lock = threading.Lock()
     
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ZohoSDKInitializer, cls).__new__(cls)
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(ZohoSDKInitializer, cls).__new__(cls)
         return cls._instance
     
     def __init__(self):
-        if not self._initialized:
-            self._initialized = True
-            self._initialize_sdk()
+        cls = type(self)
+        if cls._initialized:
+            return
+        with cls._lock:
+            # Re-check under the lock so concurrent callers initialize only once
+            if not cls._initialized:
+                self._initialize_sdk()
+                cls._initialized = True
     
     def _initialize_sdk(self):
         """Initialize the Zoho SDK with configuration"""
-        logger = Logger.get_instance(Logger.Levels.INFO, "./sdk_log.log")
-        userEmail = os.getenv('ZOHO_USER_EMAIL')
-        print("User Email:", userEmail)
-        user = UserSignature(userEmail)
+        sdk_logger = Logger.get_instance(Logger.Levels.INFO, "./sdk_log.log")
+        user = UserSignature(ZOHO_USER_EMAIL)
 
         # environment = CADataCenter.PRODUCTION()
         environment = USDataCenter.PRODUCTION()
-        print("Environment Created:", environment)
         # Initialize OAuth token
-        clientId = os.getenv('ZOHO_CLIENT_ID')
-        clientSecret = os.getenv('ZOHO_CLIENT_SECRET')
-        token = os.getenv('ZOHO_REFRESH_TOKEN')
-        redirectUrl = os.getenv('ZOHO_REDIRECT_URL')
         token = OAuthToken(
-            client_id=clientId,
-            client_secret=clientSecret,
-            token=token,
+            client_id=ZOHO_CLIENT_ID,
+            client_secret=ZOHO_CLIENT_SECRET,
+            token=ZOHO_REFRESH_TOKEN,
             token_type=TokenType.REFRESH,
-            redirect_url=redirectUrl,
+            redirect_url=ZOHO_REDIRECT_URL,
         )
-        print("Token Generated:", token)
         store = FileStore(file_path="./zoho_sdk_tokens.txt")
 
         config = SDKConfig(
@@ -65,9 +77,9 @@ class ZohoSDKInitializer:
             store=store,
             sdk_config=config,
             resource_path=resource_path,
-            logger=logger
+            logger=sdk_logger
         )
-        print("Zoho SDK initialized successfully")
+        logger.info(f"Zoho SDK initialized successfully for {ZOHO_USER_EMAIL}")
     
     def get_instance(self):
         """Return the singleton instance"""
@@ -76,8 +88,9 @@ class ZohoSDKInitializer:
     @classmethod
     def reset_instance(cls):
         """Reset the singleton instance (useful for testing)"""
-        cls._instance = None
-        cls._initialized = False
+        with cls._lock:
+            cls._instance = None
+            cls._initialized = False
 
 
 # Backward compatibility function
@@ -1,12 +1,226 @@
 import os
+import re
+import textwrap
+import asyncio
+import functools
 import logging
-from typing import Dict, Any, Optional
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, From, To, Subject, PlainTextContent, HtmlContent
-import json
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import httpx
 
 logger = logging.getLogger(__name__)
 
+# SendGrid v3 accepts at most 1000 personalizations per mail/send request
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+
+SENDGRID_API_URL = 'https://api.sendgrid.com'
+SENDGRID_MAIL_SEND_PATH = '/v3/mail/send'
+
+# Matches the Jinja-style {{ placeholders }} used in coldmain.html
+_COLD_EMAIL_PLACEHOLDER = re.compile(r'\{\{\s*(crm_fullname|crm_title|crm_email)\s*\}\}')
+
+# Matches {field} placeholders; CSS blocks like ".a { color: red; }" do not match
+_FORMAT_FIELD = re.compile(r'\{(\w+)\}')
+
+def _renderer_source(text: str) -> str:
+    """Generate a ''.join(...) expression that renders a {field} style template from dict d"""
+    # split() alternates literal text and field names: [text, field, text, ..., text]
+    pieces = []
+    for index, part in enumerate(_FORMAT_FIELD.split(text)):
+        if index % 2 == 0:
+            if part:
+                pieces.append(repr(part))
+        else:
+            # Unknown placeholders are left in place instead of raising
+            pieces.append(f"(str(d[{part!r}]) if {part!r} in d else {'{' + part + '}'!r})")
+    return "''.join((" + ''.join(piece + ', ' for piece in pieces) + "))"
+
+def _compile_renderer(template: Dict[str, str]) -> Callable[[Dict[str, Any]], Tuple[str, str, str]]:
+    """Specialize a template into a function returning (subject, html_content, plain_content)"""
+    fields = ', '.join(_renderer_source(template[field]) for field in ('subject', 'html', 'plain'))
+    return eval(compile(f"lambda d: ({fields})", '<email template>', 'eval'))
+
+def _load_cold_email_template() -> str:
+    """Load the cold email HTML template from file"""
+    try:
+        template_path = os.path.join('templates', 'coldmain.html')
+        with open(template_path, 'r', encoding='utf-8') as file:
+            template_content = file.read()
+
+        # Replace template placeholders with format placeholders in a single pass
+        template_content = _COLD_EMAIL_PLACEHOLDER.sub(lambda m: '{' + m.group(1) + '}', template_content)
+
+        return template_content
+
+    except FileNotFoundError:
+        logger.error(f"Cold email template file not found: {template_path}")
+        return _get_fallback_cold_email_template()
+    except Exception as e:
+        logger.error(f"Error loading cold email template: {e}")
+        return _get_fallback_cold_email_template()
+
+def _get_fallback_cold_email_template() -> str:
+    """Return a fallback cold email template if file loading fails"""
+    return '''
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <title>Cold Email</title>
+    </head>
+    <body>
+        <h2>Re: Your Post About Hiring Engineers</h2>
+        <p>Hi <strong>{crm_fullname}</strong>,</p>
+        <p>Hope you're having a productive week!</p>
+        <p>We've all been there – drowning in resumes for key roles like <strong>{crm_title}</strong>, trying to find that perfect fit.</p>
+        <p>What if there was a way to cut through that clutter quickly and effectively? That's exactly what <strong>Referrals AI</strong> is designed to do.</p>
+        <p>Would you be open to a brief chat next week?</p>
+        <p>Best,<br>Jha</p>
+    </body>
+    </html>
+    '''
+
+# Email templates, loaded once at import (the cold email HTML is read from disk)
+_TEMPLATES = {
+    'default': {
+        'subject': 'Default Email from CRM Sync Service',
+        'html': '''
+        <html>
+        <body>
+            <h2>Hello from CRM Sync Service!</h2>
+            <p>This is a default email template.</p>
+            <p>Message: {message}</p>
+            <p>Best regards,<br>CRM Sync Team</p>
+        </body>
+        </html>
+        ''',
+        'plain': '''
+        Hello from CRM Sync Service!
+
+        This is a default email template.
+        Message: {message}
+
+        Best regards,
+        CRM Sync Team
+        '''
+    },
+    'lead_notification': {
+        'subject': 'New Lead Notification - {lead_name}',
+        'html': '''
+        <html>
+        <body>
+            <h2>New Lead Added</h2>
+            <p>A new lead has been synchronized from Zoho CRM:</p>
+            <ul>
+                <li><strong>Name:</strong> {lead_name}</li>
+                <li><strong>Email:</strong> {lead_email}</li>
+                <li><strong>Phone:</strong> {lead_phone}</li>
+                <li><strong>Sync Time:</strong> {sync_time}</li>
+            </ul>
+            <p>Please follow up with this lead as soon as possible.</p>
+            <p>Best regards,<br>CRM Sync Team</p>
+        </body>
+        </html>
+        ''',
+        'plain': '''
+        New Lead Added
+
+        A new lead has been synchronized from Zoho CRM:
+
+        Name: {lead_name}
+        Email: {lead_email}
+        Phone: {lead_phone}
+        Sync Time: {sync_time}
+
+        Please follow up with this lead as soon as possible.
+
+        Best regards,
+        CRM Sync Team
+        '''
+    },
+    'sync_report': {
+        'subject': 'Daily Lead Sync Report',
+        'html': '''
+        <html>
+        <body>
+            <h2>Daily Lead Sync Report</h2>
+            <p>The daily lead synchronization has been completed.</p>
+            <ul>
+                <li><strong>Total Leads Processed:</strong> {total_leads}</li>
+                <li><strong>New Leads Added:</strong> {new_leads}</li>
+                <li><strong>Updated Leads:</strong> {updated_leads}</li>
+                <li><strong>Sync Time:</strong> {sync_time}</li>
+                <li><strong>Status:</strong> {status}</li>
+            </ul>
+            {error_message}
+            <p>Best regards,<br>CRM Sync Team</p>
+        </body>
+        </html>
+        ''',
+        'plain': '''
+        Daily Lead Sync Report
+
+        The daily lead synchronization has been completed.
+
+        Total Leads Processed: {total_leads}
+        New Leads Added: {new_leads}
+        Updated Leads: {updated_leads}
+        Sync Time: {sync_time}
+        Status: {status}
+
+        {error_message}
+
+        Best regards,
+        CRM Sync Team
+        '''
+    },
+    'cold_email': {
+        'subject': 'Re: Your Post About Hiring Engineers',
+        'html': _load_cold_email_template(),
+        'plain': '''
+        Re: Your Post About Hiring Engineers
+
+        Hi {crm_fullname},
+
+        Hope you're having a productive week!
+
+        We've all been there – drowning in resumes for key roles like {crm_title}, trying to find that perfect fit. It's a massive time sink, and sometimes the best candidates slip through the cracks.
+
+        What if there was a way to cut through that clutter quickly and effectively? That's exactly what Referrals AI is designed to do. It's an AI-powered tool that pre-vets resumes, turning that overwhelming pile into a manageable list of potential candidates with smart scoring and analysis.
+
+        Benefits:
+        - Significantly less time spent on initial resume screening
+        - A clearer picture of candidate fit before you even pick up the phone
+        - Faster identification of top talent for your {crm_title} openings
+
+        I'd love to show you firsthand how Referrals AI can integrate into your current process and deliver these results.
+
+        Would you be open to a brief chat next week? I can give you a quick overview and explore how it can specifically address your hiring challenges for roles like {crm_title}.
+
+        Thanks for your time, and I look forward to the possibility of connecting.
+
+        Best,
+        Jha
+        '''
+    }
+}
+
+# Drop the source-code indentation so it is not sent with every email
+for _template in _TEMPLATES.values():
+    for _field in ('html', 'plain'):
+        _template[_field] = textwrap.dedent(_template[_field]).strip()
+
+# Templates specialized into renderers once at import and shared by every MailService
+_RENDERERS = {name: _compile_renderer(template) for name, template in _TEMPLATES.items()}
+
+def _render_template(template_name: str, template_data: Dict[str, Any]) -> tuple:
+    """Render a template into (subject, html_content, plain_content)"""
+    return _RENDERERS.get(template_name, _RENDERERS['default'])(template_data)
+
+@functools.lru_cache(maxsize=256)
+def _render_template_cached(template_name: str, template_items: frozenset) -> tuple:
+    """Memoized _render_template for hashable template data"""
+    return _render_template(template_name, dict(template_items))
+
 class MailService:
     """
     Mail service class for sending emails using SendGrid
@@ -16,58 +230,66 @@ class MailService:
         self.api_key = os.getenv('SENDGRID_API_KEY')
         if not self.api_key:
             logger.warning("SENDGRID_API_KEY environment variable not set")
-            self.sendgrid_client = None
-        else:
-            self.sendgrid_client = SendGridAPIClient(api_key=self.api_key)
+        
+        # Created lazily so the client is bound to the event loop that uses it;
+        # close() drops it and the next send creates a new one
+        self._client: Optional[httpx.AsyncClient] = None
         
         self.from_email = os.getenv('FROM_EMAIL', 'noreply@example.com')
         self.from_name = os.getenv('FROM_NAME', 'CRM Sync Service')
+        
+        # Parts of the mail/send body that are identical for every message
+        self._base_payload = {'from': {'email': self.from_email, 'name': self.from_name}}
+        
+        # Bounds the number of SendGrid requests in flight across all callers
+        self._semaphore = asyncio.Semaphore(int(os.getenv('MAIL_CONCURRENCY', '20')))
     
-    def _load_cold_email_template(self) -> str:
-        """Load the cold email HTML template from file"""
-        try:
-            template_path = os.path.join('templates', 'coldmain.html')
-            with open(template_path, 'r', encoding='utf-8') as file:
-                template_content = file.read()
-            
-            # Use a more robust approach to replace template placeholders
-            # First, escape any existing format braces that are not template placeholders
-            import re
-            
-            # Replace template placeholders with format placeholders
-            template_content = re.sub(r'\{\{\s*crm_fullname\s*\}\}', '{crm_fullname}', template_content)
-            template_content = re.sub(r'\{\{\s*crm_title\s*\}\}', '{crm_title}', template_content)
-            template_content = re.sub(r'\{\{\s*crm_email\s*\}\}', '{crm_email}', template_content)
-            
-            return template_content
-            
-        except FileNotFoundError:
-            logger.error(f"Cold email template file not found: {template_path}")
-            return self._get_fallback_cold_email_template()
-        except Exception as e:
-            logger.error(f"Error loading cold email template: {e}")
-            return self._get_fallback_cold_email_template()
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the HTTP client used for SendGrid requests, creating it on first use"""
+        if self._client is None:
+            # One keep-alive HTTP/2 pool per service so bulk sends reuse the TLS connection
+            self._client = httpx.AsyncClient(
+                base_url=SENDGRID_API_URL,
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(
+                    max_connections=50,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=60
+                ),
+                headers={'Authorization': f'Bearer {self.api_key}'}
+            )
+        return self._client
     
-    def _get_fallback_cold_email_template(self) -> str:
-        """Return a fallback cold email template if file loading fails"""
-        return '''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Cold Email</title>
-        </head>
-        <body>
-            <h2>Re: Your Post About Hiring Engineers</h2>
-            <p>Hi <strong>{crm_fullname}</strong>,</p>
-            <p>Hope you're having a productive week!</p>
-            <p>We've all been there – drowning in resumes for key roles like <strong>{crm_title}</strong>, trying to find that perfect fit.</p>
-            <p>What if there was a way to cut through that clutter quickly and effectively? That's exactly what <strong>Referrals AI</strong> is designed to do.</p>
-            <p>Would you be open to a brief chat next week?</p>
-            <p>Best,<br>Jha</p>
-        </body>
-        </html>
-        '''
+    async def close(self) -> None:
+        """Close the underlying HTTP client and its pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _build_payload(self, to_emails: List[str], subject: str, html_content: str, plain_content: str) -> Dict[str, Any]:
+        """Build the SendGrid v3 mail/send request body, one personalization per recipient"""
+        return {
+            **self._base_payload,
+            'personalizations': [{'to': [{'email': email}]} for email in to_emails],
+            'subject': subject,
+            'content': [
+                {'type': 'text/plain', 'value': plain_content},
+                {'type': 'text/html', 'value': html_content}
+            ]
+        }
+    
+    async def _post_payload(self, payload: Dict[str, Any], recipient: str) -> bool:
+        """POST a mail/send payload to SendGrid and report whether it was accepted"""
+        async with self._semaphore:
+            response = await self._get_client().post(SENDGRID_MAIL_SEND_PATH, json=payload)
+        
+        if response.status_code in [200, 202]:
+            logger.debug("Email sent successfully to %s. Status: %s", recipient, response.status_code)
+            return True
+        else:
+            logger.error(f"Failed to send email to {recipient}. Status: {response.status_code}, Body: {response.text}")
+            return False
     
     def get_email_template(self, template_name: str, template_data: Dict[str, Any] = None) -> tuple:
         """
@@ -77,152 +299,13 @@ class MailService:
         if template_data is None:
             template_data = {}
         
-        templates = {
-            'default': {
-                'subject': 'Default Email from CRM Sync Service',
-                'html': '''
-                <html>
-                <body>
-                    <h2>Hello from CRM Sync Service!</h2>
-                    <p>This is a default email template.</p>
-                    <p>Message: {message}</p>
-                    <p>Best regards,<br>CRM Sync Team</p>
-                </body>
-                </html>
-                ''',
-                'plain': '''
-                Hello from CRM Sync Service!
-                
-                This is a default email template.
-                Message: {message}
-                
-                Best regards,
-                CRM Sync Team
-                '''
-            },
-            'lead_notification': {
-                'subject': 'New Lead Notification - {lead_name}',
-                'html': '''
-                <html>
-                <body>
-                    <h2>New Lead Added</h2>
-                    <p>A new lead has been synchronized from Zoho CRM:</p>
-                    <ul>
-                        <li><strong>Name:</strong> {lead_name}</li>
-                        <li><strong>Email:</strong> {lead_email}</li>
-                        <li><strong>Phone:</strong> {lead_phone}</li>
-                        <li><strong>Sync Time:</strong> {sync_time}</li>
-                    </ul>
-                    <p>Please follow up with this lead as soon as possible.</p>
-                    <p>Best regards,<br>CRM Sync Team</p>
-                </body>
-                </html>
-                ''',
-                'plain': '''
-                New Lead Added
-                
-                A new lead has been synchronized from Zoho CRM:
-                
-                Name: {lead_name}
-                Email: {lead_email}
-                Phone: {lead_phone}
-                Sync Time: {sync_time}
-                
-                Please follow up with this lead as soon as possible.
-                
-                Best regards,
-                CRM Sync Team
-                '''
-            },
-            'sync_report': {
-                'subject': 'Daily Lead Sync Report',
-                'html': '''
-                <html>
-                <body>
-                    <h2>Daily Lead Sync Report</h2>
-                    <p>The daily lead synchronization has been completed.</p>
-                    <ul>
-                        <li><strong>Total Leads Processed:</strong> {total_leads}</li>
-                        <li><strong>New Leads Added:</strong> {new_leads}</li>
-                        <li><strong>Updated Leads:</strong> {updated_leads}</li>
-                        <li><strong>Sync Time:</strong> {sync_time}</li>
-                        <li><strong>Status:</strong> {status}</li>
-                    </ul>
-                    {error_message}
-                    <p>Best regards,<br>CRM Sync Team</p>
-                </body>
-                </html>
-                ''',
-                'plain': '''
-                Daily Lead Sync Report
-                
-                The daily lead synchronization has been completed.
-                
-                Total Leads Processed: {total_leads}
-                New Leads Added: {new_leads}
-                Updated Leads: {updated_leads}
-                Sync Time: {sync_time}
-                Status: {status}
-                
-                {error_message}
-                
-                Best regards,
-                CRM Sync Team
-                '''
-            },
-            'cold_email': {
-                'subject': 'Re: Your Post About Hiring Engineers',
-                'html': self._load_cold_email_template(),
-                'plain': '''
-                Re: Your Post About Hiring Engineers
-
-                Hi {crm_fullname},
-
-                Hope you're having a productive week!
-
-                We've all been there – drowning in resumes for key roles like {crm_title}, trying to find that perfect fit. It's a massive time sink, and sometimes the best candidates slip through the cracks.
-
-                What if there was a way to cut through that clutter quickly and effectively? That's exactly what Referrals AI is designed to do. It's an AI-powered tool that pre-vets resumes, turning that overwhelming pile into a manageable list of potential candidates with smart scoring and analysis.
-
-                Benefits:
-                - Significantly less time spent on initial resume screening
-                - A clearer picture of candidate fit before you even pick up the phone
-                - Faster identification of top talent for your {crm_title} openings
-
-                I'd love to show you firsthand how Referrals AI can integrate into your current process and deliver these results.
-
-                Would you be open to a brief chat next week? I can give you a quick overview and explore how it can specifically address your hiring challenges for roles like {crm_title}.
-
-                Thanks for your time, and I look forward to the possibility of connecting.
-
-                Best,
-                Jha
-                '''
-            }
-        }
-        
-        template = templates.get(template_name, templates['default'])
-        
         try:
-            subject = template['subject'].format(**template_data)
-            
-            # Handle cold_email template differently to avoid CSS formatting issues
-            if template_name == 'cold_email':
-                html_content = template['html']
-                # Manually replace placeholders in HTML content
-                html_content = html_content.replace('{crm_fullname}', template_data.get('crm_fullname', ''))
-                html_content = html_content.replace('{crm_title}', template_data.get('crm_title', ''))
-                html_content = html_content.replace('{crm_email}', template_data.get('crm_email', ''))
-            else:
-                html_content = template['html'].format(**template_data)
-            
-            plain_content = template['plain'].format(**template_data)
-            
-            return subject, html_content, plain_content
-        except KeyError as e:
-            logger.error(f"Missing template data key: {e}")
-            # Fallback to default template
-            return self.get_email_template('default', {'message': f'Template error: missing key {e}'})
+            template_items = frozenset(template_data.items())
+        except TypeError:
+            # Unhashable values (e.g. lists from /send-email) cannot be memoized
+            return _render_template(template_name, template_data)
+        
+        return _render_template_cached(template_name, template_items)
     
     async def send_mail(
         self, 
@@ -248,8 +331,8 @@ class MailService:
             bool: True if email sent successfully, False otherwise
         """
         
-        if not self.sendgrid_client:
-            logger.error("SendGrid client not initialized. Check SENDGRID_API_KEY environment variable.")
+        if not self.api_key:
+            logger.error("SendGrid API key not configured. Check SENDGRID_API_KEY environment variable.")
             return False
         
         try:
@@ -264,23 +347,10 @@ class MailService:
             # print(f"\n\n\nSending email to {to_email} with subject {subject} and content {html_content}\n\n\n")
             
             # Create the email
-            message = Mail(
-                from_email=From(self.from_email, self.from_name),
-                to_emails=To(to_email),
-                subject=Subject(subject),
-                plain_text_content=PlainTextContent(plain_content),
-                html_content=HtmlContent(html_content)
-            )
+            payload = self._build_payload([to_email], subject, html_content, plain_content)
             
             # Send the email
-            response = self.sendgrid_client.send(message)
-            
-            if response.status_code in [200, 202]:
-                logger.info(f"Email sent successfully to {to_email}. Status: {response.status_code}")
-                return True
-            else:
-                logger.error(f"Failed to send email to {to_email}. Status: {response.status_code}, Body: {response.body}")
-                return False
+            return await self._post_payload(payload, to_email)
                 
         except Exception as e:
             logger.error(f"Error sending email to {to_email}: {str(e)}")
@@ -306,17 +376,45 @@ class MailService:
         
         results = {'sent': 0, 'failed': 0}
         
-        for email in recipients:
-            success = await self.send_mail(
-                to_email=email,
-                template_name=template_name,
-                template_data=template_data
-            )
-            
-            if success:
-                results['sent'] += 1
+        if not self.api_key:
+            logger.error("SendGrid API key not configured. Check SENDGRID_API_KEY environment variable.")
+            results['failed'] = len(recipients)
+            return results
+        
+        # Every recipient gets the same content, so render once and send one
+        # request per batch of personalizations instead of one per recipient
+        subject, html_content, plain_content = self.get_email_template(template_name, template_data)
+        batches = [
+            recipients[i:i + SENDGRID_MAX_PERSONALIZATIONS]
+            for i in range(0, len(recipients), SENDGRID_MAX_PERSONALIZATIONS)
+        ]
+        
+        async def _send_batch(batch: List[str]) -> bool:
+            payload = self._build_payload(batch, subject, html_content, plain_content)
+            return await self._post_payload(payload, f"{len(batch)} recipients")
+        
+        outcomes = await asyncio.gather(
+            *[_send_batch(batch) for batch in batches],
+            return_exceptions=True
+        )
+        
+        for batch, outcome in zip(batches, outcomes):
+            if outcome is True:
+                results['sent'] += len(batch)
             else:
-                results['failed'] += 1
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error sending bulk email batch of {len(batch)} recipients: {outcome}")
+                results['failed'] += len(batch)
         
         logger.info(f"Bulk email results: {results}")
         return results
+
+
+_mail_service: Optional[MailService] = None
+
+def get_mail_service() -> MailService:
+    """Return the process-wide MailService so every caller shares one connection pool"""
+    global _mail_service
+    if _mail_service is None:
+        _mail_service = MailService()
+    return _mail_service
@@ -1,31 +1,115 @@
 from queue import Empty
 import traceback
 from zcrmsdk.src.com.zoho.crm.api.util.choice import Choice
-from initialize_sdk import initialize_sdk
+from initialize_sdk import initialize_sdk, ZOHO_CLIENT_ID, ZOHO_CLIENT_SECRET, ZOHO_REFRESH_TOKEN
 from zcrmsdk.src.com.zoho.crm.api.record import RecordOperations
-from zcrmsdk.src.com.zoho.crm.api.record import GetRecordsParam
 from zcrmsdk.src.com.zoho.crm.api.record import Record
-from zcrmsdk.src.com.zoho.crm.api import ParameterMap
 from zcrmsdk.src.com.zoho.crm.api.record.body_wrapper import BodyWrapper
+import httpx
 import psycopg2
+from psycopg2.extras import execute_values
 import os
+import time
+import types
 import logging
 import asyncio
+import contextlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-from mail_service import MailService
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from mail_service import get_mail_service
 
 logger = logging.getLogger(__name__)
 
+# Zoho CRM REST endpoints (US data center, matching initialize_sdk)
+ZOHO_API_URL = os.getenv('ZOHO_API_URL', 'https://www.zohoapis.com')
+ZOHO_ACCOUNTS_URL = os.getenv('ZOHO_ACCOUNTS_URL', 'https://accounts.zoho.com')
+
+# Only the lead fields the sync actually reads
+ZOHO_LEAD_FIELDS = 'id,Full_Name,Email,Phone,Lead_Status,Designation'
+
+# Zoho CRM returns at most 200 records per page
+ZOHO_PAGE_SIZE = 200
+
+# Number of Zoho pages requested concurrently, kept low for Zoho's rate limits
+ZOHO_FETCH_CONCURRENCY = 5
+
+# Number of leads buffered before they are written to the database
+DB_BATCH_SIZE = 500
+
+# Dedicated threads for the blocking Zoho SDK and psycopg2 calls made during a sync,
+# so a long sync never competes with the web server's threadpool
+SYNC_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sync")
+
+async def run_blocking(func, *args):
+    """Run a blocking callable on SYNC_EXECUTOR and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(SYNC_EXECUTOR, functools.partial(func, *args))
+
+# Environment-derived settings, read once at import (app.py loads .env first)
+_DB_CONFIG = types.MappingProxyType({
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'kishoresuresh'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'dbname': os.getenv('DB_NAME', 'crm_sync'),
+    'port': os.getenv('DB_PORT', '5432')
+})
+_NOTIFICATION_EMAILS = tuple(
+    email.strip() for email in os.getenv('NOTIFICATION_EMAILS', '').split(',') if email.strip()
+)
+
+# (access token, expiry as epoch seconds) minted from the refresh token
+_zoho_access_token: Optional[Tuple[str, float]] = None
+# Serializes token refreshes; Zoho limits how many access tokens a refresh token may mint
+_zoho_token_lock = asyncio.Lock()
+
+def clear_zoho_access_token(rejected_token: str) -> None:
+    """Drop the cached access token if it is still the one Zoho rejected as revoked or expired"""
+    global _zoho_access_token
+    if _zoho_access_token is not None and _zoho_access_token[0] == rejected_token:
+        _zoho_access_token = None
+
+def _cached_zoho_access_token() -> Optional[str]:
+    """Return the cached access token if it has not expired"""
+    if _zoho_access_token is not None and _zoho_access_token[1] > time.time():
+        return _zoho_access_token[0]
+    return None
+
+async def get_zoho_access_token(client: httpx.AsyncClient) -> str:
+    """Return a cached Zoho OAuth access token, refreshing it when it is about to expire"""
+    global _zoho_access_token
+    access_token = _cached_zoho_access_token()
+    if access_token is not None:
+        return access_token
+    
+    async with _zoho_token_lock:
+        # Re-check under the lock: concurrent callers wait for one refresh and share its token
+        access_token = _cached_zoho_access_token()
+        if access_token is not None:
+            return access_token
+        
+        response = await client.post(f"{ZOHO_ACCOUNTS_URL}/oauth/v2/token", params={
+            'grant_type': 'refresh_token',
+            'client_id': ZOHO_CLIENT_ID,
+            'client_secret': ZOHO_CLIENT_SECRET,
+            'refresh_token': ZOHO_REFRESH_TOKEN
+        })
+        response.raise_for_status()
+        body = response.json()
+        if 'access_token' not in body:
+            raise RuntimeError(f"Zoho token refresh failed: {body.get('error', body)}")
+        
+        # Treat the token as expired a minute early so it never lapses mid-sync
+        _zoho_access_token = (body['access_token'], time.time() + int(body.get('expires_in', 3600)) - 60)
+        return _zoho_access_token[0]
+
 class LeadSyncService:
+    # Set once the leads table has been created/verified in this process
+    _table_ready = False
+    
     def __init__(self):
-        self.db_config = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'user': os.getenv('DB_USER', 'kishoresuresh'),
-            'password': os.getenv('DB_PASSWORD', ''),
-            'dbname': os.getenv('DB_NAME', 'crm_sync'),
-            'port': os.getenv('DB_PORT', '5432')
-        }
+        self.db_config = _DB_CONFIG
         self.sync_stats = {
             'total_leads': 0,
             'new_leads': 0,
@@ -33,22 +117,13 @@ class LeadSyncService:
             'errors': [],
             'new_leads_details': []  # Store new lead details for email notifications
         }
-        self.mail_service = MailService()
-        self.notification_emails = self._get_notification_emails()
-    
-    def _get_notification_emails(self) -> List[str]:
-        """Get list of email addresses for notifications"""
-        emails_str = os.getenv('NOTIFICATION_EMAILS', '')
-        if emails_str:
-            return [email.strip() for email in emails_str.split(',') if email.strip()]
-        return []
+        # Shared with the web app so syncs reuse its SendGrid connections
+        self.mail_service = get_mail_service()
+        self.notification_emails = _NOTIFICATION_EMAILS
     
-    def create_database_table(self):
+    def create_database_table(self, cursor):
         """Create the leads table if it doesn't exist"""
         try:
-            db = psycopg2.connect(**self.db_config)
-            cursor = db.cursor()
-            
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS leads (
                     id VARCHAR(255) PRIMARY KEY,
@@ -66,129 +141,122 @@ class LeadSyncService:
                 CREATE INDEX IF NOT EXISTS idx_leads_email ON leads(email)
             """)
             
-            db.commit()
-            cursor.close()
-            db.close()
             logger.info("Database table created/verified successfully")
             
         except Exception as e:
             logger.error(f"Error creating database table: {e}")
             raise
     
-    def get_existing_lead_ids(self) -> set:
-        """Get all existing lead IDs from the database"""
-        try:
-            db = psycopg2.connect(**self.db_config)
-            cursor = db.cursor()
-            
-            cursor.execute("SELECT id FROM leads")
-            existing_ids = {row[0] for row in cursor.fetchall()}
-            
-            cursor.close()
-            db.close()
-            
-            return existing_ids
-            
-        except Exception as e:
-            logger.error(f"Error fetching existing lead IDs: {e}")
-            return set()
+    async def _fetch_leads_page(self, client: httpx.AsyncClient, page: int, retry_auth: bool = True) -> Optional[Tuple[List[Dict], bool]]:
+        """Fetch one page of leads; returns (records, more_records) or None on failure"""
+        response = await client.get('/crm/v2/Leads', params={
+            'fields': ZOHO_LEAD_FIELDS,
+            'page': page,
+            'per_page': ZOHO_PAGE_SIZE
+        })
+        logger.debug("Zoho leads page %s status=%s", page, response.status_code)
+        
+        # The token this request was sent with; other pages may have replaced it since
+        rejected_token = response.request.headers.get('Authorization', '').removeprefix('Zoho-oauthtoken ')
+        
+        if response.status_code == 401 and retry_auth:
+            # Drop the token unless another page already replaced it, then retry the
+            # page once; pages rejected together wait for a single refresh
+            clear_zoho_access_token(rejected_token)
+            access_token = await get_zoho_access_token(client)
+            client.headers['Authorization'] = f"Zoho-oauthtoken {access_token}"
+            return await self._fetch_leads_page(client, page, retry_auth=False)
+
+        if response.status_code == 200:
+            body = response.json()
+            return body.get('data') or [], bool(body.get('info', {}).get('more_records'))
+        elif response.status_code == 204:
+            # Past the last page
+            return [], False
+        else:
+            logger.error(f"Failed to fetch leads page {page}. Status code: {response.status_code}, Body: {response.text}")
+            # Record the failure so a sync cut short is not reported as a success
+            self.sync_stats['errors'].append(f"Zoho API error: leads page {page} returned status {response.status_code}")
+            if response.status_code == 401:
+                # Even the fresh token was rejected; don't reuse it on the next sync
+                clear_zoho_access_token(rejected_token)
+            return None
     
-    def fetch_leads_from_zoho(self) -> Optional[List]:
-        """Fetch leads from Zoho CRM"""
+    async def iter_leads_from_zoho(self) -> AsyncIterator[Dict]:
+        """Yield leads from Zoho CRM as plain JSON records, fetching one window of pages at a time"""
+        fetched = 0
         try:
-            initialize_sdk()
-            module_api_name = "Leads"
-            param_instance = ParameterMap()
-            param_instance.add(GetRecordsParam.page, 1)
-            param_instance.add(GetRecordsParam.per_page, 200)
-
-            response = RecordOperations().get_records(module_api_name, param_instance)
-            logger.info(f"Response Received from Zoho CRM: {response}")
-
-            if response is None:
-                logger.warning("No response received from Zoho CRM.")
-                return None
-
-            logger.info(f"Status Code: {response.get_status_code()}")
-
-            if response.get_status_code() == 200:
-                record_list = response.get_object().get_data()
-                logger.info(f"Successfully fetched {len(record_list) if record_list else 0} leads from Zoho CRM")
-                return record_list
-            else:
-                logger.error(f"Failed to fetch leads. Status code: {response.get_status_code()}")
-                return None
+            async with httpx.AsyncClient(base_url=ZOHO_API_URL, timeout=30) as client:
+                access_token = await get_zoho_access_token(client)
+                client.headers['Authorization'] = f"Zoho-oauthtoken {access_token}"
+                
+                first_page = await self._fetch_leads_page(client, 1)
+                if first_page is None:
+                    return
+                records, more_records = first_page
+                for record in records:
+                    yield record
+                fetched += len(records)
+                
+                # Zoho only reports whether more records exist, not the page count, so
+                # fetch the following pages in concurrent windows until one is the last
+                next_page = 2
+                while more_records:
+                    window = range(next_page, next_page + ZOHO_FETCH_CONCURRENCY)
+                    pages = await asyncio.gather(*[self._fetch_leads_page(client, page) for page in window])
+                    
+                    for page in pages:
+                        if page is None:
+                            more_records = False
+                            break
+                        records, more_records = page
+                        for record in records:
+                            yield record
+                        fetched += len(records)
+                        if not more_records:
+                            break
+                    
+                    next_page += ZOHO_FETCH_CONCURRENCY
+            
+            logger.info(f"Successfully fetched {fetched} leads from Zoho CRM")
                 
         except Exception as e:
             logger.error(f"Error fetching leads from Zoho CRM: {e}")
             self.sync_stats['errors'].append(f"Zoho API error: {str(e)}")
-            return None
     
-    def save_to_local_db(self, records: List) -> None:
+    def save_to_local_db(self, records: List[Dict]) -> None:
         """Save leads to local database"""
         if not records:
             logger.info("No records to save")
             return
         
+        db = None
         try:
-            # Create table if not exists
-            self.create_database_table()
-            
-            # Get existing lead IDs
-            existing_ids = self.get_existing_lead_ids()
-            # print(f"Existing lead IDs: {existing_ids}")
-            
+            # One connection for the table check and the upsert
             db = psycopg2.connect(**self.db_config)
             cursor = db.cursor()
             
+            # Create table if not exists (once per process)
+            if not LeadSyncService._table_ready:
+                self.create_database_table(cursor)
+            
+            # One timestamp for every row and lead detail in this sync
+            now = datetime.now()
+            now_iso = now.isoformat()
+            # Lead ID -> (row to upsert, CRM key values); keyed so duplicate IDs collapse to one row
+            leads = {}
+            
             for record in records:
                 try:
-                    lead_id = record.get_id()
+                    lead_id = record['id']
                     # print(f"Processing lead ID: {lead_id}")
-                    data = record.get_key_values()
+                    data = record
                     full_name = data.get("Full_Name", "")
                     email = data.get("Email", "")
                     phone = data.get("Phone", "")
-                    lead_status_choice = data.get('Lead_Status')
-                    lead_status = lead_status_choice.get_value() if lead_status_choice else ''
-                    lead_status = str(lead_status)
-                    
-                    # Track if this is a new or updated lead
-                    is_new_lead = str(lead_id) not in existing_ids
-                    # print(f"Is new lead: {is_new_lead}")
-                    
-                    cursor.execute("""
-                        INSERT INTO leads (id, full_name, email, phone, lead_status, created_at, updated_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (id) DO UPDATE SET
-                            full_name = EXCLUDED.full_name,
-                            email = EXCLUDED.email,
-                            phone = EXCLUDED.phone,
-                            lead_status = EXCLUDED.lead_status,
-                            updated_at = EXCLUDED.updated_at
-                    """, (lead_id, full_name, email, phone, lead_status, datetime.now(), datetime.now()))
+                    lead_status = str(data.get('Lead_Status') or '')
                     
-                    if is_new_lead:
-                        self.sync_stats['new_leads'] += 1
-                        # Store new lead details for email notification
-                        # print(f"New lead detected Data: {data}")
-                        logger.info(f"New lead detected: {full_name} ({email} Lead Status : {lead_status} designation : {data.get('Designation', '')} \n{data})")
-                        lead_details = {
-                            'id': lead_id,
-                            'full_name': full_name,
-                            'email': email,
-                            'phone': phone,
-                            'title': data.get("Designation", "Engineer"),  # Get title from CRM
-                            'sync_time': datetime.now().isoformat(),
-                            'Lead_Status': lead_status
-                        }
-
-                        self.sync_stats['new_leads_details'].append(lead_details)
-                        logger.info(f"New lead added to list: {full_name} ({email})")
-                    else:
-                        self.sync_stats['updated_leads'] += 1
-                    
-                    self.sync_stats['total_leads'] += 1
+                    leads[str(lead_id)] = ((str(lead_id), full_name, email, phone, lead_status, now, now), data)
                     
                 except Exception as e:
                     error_msg = f"Error processing lead {lead_id}: {str(e)}"
@@ -197,9 +265,56 @@ class LeadSyncService:
                     self.sync_stats['errors'].append(error_msg)
                     continue
 
+            # Upsert all leads in one statement; xmax = 0 only for rows that were
+            # inserted, which tells new leads from updated ones without a prior SELECT
+            results = execute_values(cursor, """
+                INSERT INTO leads (id, full_name, email, phone, lead_status, created_at, updated_at)
+                VALUES %s
+                ON CONFLICT (id) DO UPDATE SET
+                    full_name = EXCLUDED.full_name,
+                    email = EXCLUDED.email,
+                    phone = EXCLUDED.phone,
+                    lead_status = EXCLUDED.lead_status,
+                    updated_at = EXCLUDED.updated_at
+                RETURNING id, (xmax = 0) AS was_insert
+            """, [row for row, _ in leads.values()], page_size=DB_BATCH_SIZE, fetch=True)
+            
+            # Counted locally and merged into sync_stats only after the commit, so a batch
+            # that fails to commit never queues cold emails for leads that were not saved
+            new_leads = []
+            updated_count = 0
+            for lead_id, is_new_lead in results:
+                (_, full_name, email, phone, lead_status, _, _), data = leads[lead_id]
+                
+                if is_new_lead:
+                    # Store new lead details for email notification
+                    # print(f"New lead detected Data: {data}")
+                    logger.info(f"New lead detected: {full_name} ({email} Lead Status : {lead_status} designation : {data.get('Designation', '')})")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"New lead record: {data}")
+                    lead_details = {
+                        'id': lead_id,
+                        'full_name': full_name,
+                        'email': email,
+                        'phone': phone,
+                        'title': data.get("Designation") or "Engineer",  # Get title from CRM (null when unset)
+                        'sync_time': now_iso,
+                        'Lead_Status': lead_status
+                    }
+
+                    new_leads.append(lead_details)
+                    logger.info(f"New lead added to list: {full_name} ({email})")
+                else:
+                    updated_count += 1
+
             db.commit()
             cursor.close()
-            db.close()
+            LeadSyncService._table_ready = True
+            
+            self.sync_stats['new_leads'] += len(new_leads)
+            self.sync_stats['new_leads_details'].extend(new_leads)
+            self.sync_stats['updated_leads'] += updated_count
+            self.sync_stats['total_leads'] += len(new_leads) + updated_count
             
             logger.info(f"Successfully saved {self.sync_stats['total_leads']} leads to database")
             
@@ -208,6 +323,9 @@ class LeadSyncService:
             logger.error(error_msg)
             self.sync_stats['errors'].append(error_msg)
             raise
+        finally:
+            if db is not None:
+                db.close()
     
     async def send_new_lead_notifications(self):
         """Send email notifications for new leads"""
@@ -221,29 +339,42 @@ class LeadSyncService:
         
         logger.info(f"Sending new lead notifications to {len(self.notification_emails)} recipients")
         
-        for new_lead in self.sync_stats['new_leads_details']:
+        async def _notify(email: str, new_lead: Dict, content: tuple) -> None:
+            subject, html_content, plain_content = content
             try:
-                # Send individual lead notification
-                for email in self.notification_emails:
-                    success = await self.mail_service.send_mail(
-                        to_email=email,
-                        template_name='lead_notification',
-                        template_data={
-                            'lead_name': new_lead['full_name'],
-                            'lead_email': new_lead['email'],
-                            'lead_phone': new_lead['phone'],
-                            'sync_time': new_lead['sync_time'],
-                            'lead_id': new_lead['id']
-                        }
-                    )
+                success = await self.mail_service.send_mail(
+                    to_email=email,
+                    subject=subject,
+                    html_content=html_content,
+                    plain_content=plain_content
+                )
+                
+                if success:
+                    logger.info(f"New lead notification sent to {email} for lead: {new_lead['full_name']}")
+                else:
+                    logger.error(f"Failed to send new lead notification to {email}")
                     
-                    if success:
-                        logger.info(f"New lead notification sent to {email} for lead: {new_lead['full_name']}")
-                    else:
-                        logger.error(f"Failed to send new lead notification to {email}")
-                        
             except Exception as e:
                 logger.error(f"Error sending new lead notification: {e}")
+        
+        # Render each lead's notification once, no matter how many recipients get it
+        notifications = [
+            (new_lead, self.mail_service.get_email_template('lead_notification', {
+                'lead_name': new_lead['full_name'],
+                'lead_email': new_lead['email'],
+                'lead_phone': new_lead['phone'],
+                'sync_time': new_lead['sync_time'],
+                'lead_id': new_lead['id']
+            }))
+            for new_lead in self.sync_stats['new_leads_details']
+        ]
+        
+        # Send individual lead notifications concurrently; MailService bounds the concurrency
+        await asyncio.gather(*[
+            _notify(email, new_lead, content)
+            for new_lead, content in notifications
+            for email in self.notification_emails
+        ])
     
     async def send_cold_mail_to_new_lead(self, lead_data: Dict):
         """Send cold email to a new lead using CRM data and update status based on result"""
@@ -265,7 +396,7 @@ class LeadSyncService:
                 logger.error(f"No email address found for lead: {crm_fullname}")
                 # Update status to "Lost Lead" in CRM
                 if lead_id:
-                    self.update_lead_status_in_crm(lead_id, "Lost Lead")
+                    await run_blocking(self.update_lead_status_in_crm, lead_id, "Lost Lead")
                     logger.info(f"Updated lead {lead_id} status to 'Lost Lead' - no email found")
                 return False
             
@@ -285,13 +416,13 @@ class LeadSyncService:
             if lead_id:
                 if success:
                     # Email sent successfully - update to "Contacted"
-                    self.update_lead_status_in_crm(lead_id, "Contacted")
+                    await run_blocking(self.update_lead_status_in_crm, lead_id, "Contacted")
                     logger.info(f"Sent cold email to EMAIL : {crm_email} for lead: {crm_fullname}")
                     logger.info(f"Updated lead {lead_id} status to 'Contacted'")
                     return True
                 else:
                     # Email failed to send - update to "Junk Lead"
-                    self.update_lead_status_in_crm(lead_id, "Junk Lead")
+                    await run_blocking(self.update_lead_status_in_crm, lead_id, "Junk Lead")
                     logger.error(f"Failed to send cold email to {crm_email}")
                     logger.info(f"Updated lead {lead_id} status to 'Junk Lead' - email sending failed")
                     return False
@@ -309,14 +440,13 @@ class LeadSyncService:
             # Update status to "Junk Lead" in case of error
             lead_id = lead_data.get('id', '')
             if lead_id:
-                self.update_lead_status_in_crm(lead_id, "Junk Lead")
+                await run_blocking(self.update_lead_status_in_crm, lead_id, "Junk Lead")
                 logger.info(f"Updated lead {lead_id} status to 'Junk Lead' - error occurred")
             return False
     
     def update_lead_status_in_crm(self, lead_id: str, new_status: str) -> bool:
         """Update lead status in Zoho CRM"""
         try:
-            initialize_sdk()
             module_api_name = "Leads"
             
             # Create record instance for update
@@ -359,28 +489,31 @@ class LeadSyncService:
             if len(stats['errors']) > 5:
                 error_message += f"<p>... and {len(stats['errors']) - 5} more errors</p>"
         
-        try:
-            for email in self.notification_emails:
-                success = await self.mail_service.send_mail(
-                    to_email=email,
-                    template_name='sync_report',
-                    template_data={
-                        'total_leads': str(stats['total_leads']),
-                        'new_leads': str(stats['new_leads']),
-                        'updated_leads': str(stats['updated_leads']),
-                        'sync_time': stats['sync_time'],
-                        'status': stats['status'],
-                        'error_message': error_message
-                    }
-                )
-                
-                if success:
-                    logger.info(f"Sync summary sent to {email}")
-                else:
-                    logger.error(f"Failed to send sync summary to {email}")
-                    
-        except Exception as e:
-            logger.error(f"Error sending sync summary email: {e}")
+        template_data = {
+            'total_leads': str(stats['total_leads']),
+            'new_leads': str(stats['new_leads']),
+            'updated_leads': str(stats['updated_leads']),
+            'sync_time': stats['sync_time'],
+            'status': stats['status'],
+            'error_message': error_message
+        }
+        
+        results = await asyncio.gather(*[
+            self.mail_service.send_mail(
+                to_email=email,
+                template_name='sync_report',
+                template_data=template_data
+            )
+            for email in self.notification_emails
+        ], return_exceptions=True)
+        
+        for email, result in zip(self.notification_emails, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending sync summary email to {email}: {result}")
+            elif result:
+                logger.info(f"Sync summary sent to {email}")
+            else:
+                logger.error(f"Failed to send sync summary to {email}")
     
     def get_sync_statistics(self) -> Dict:
         """Get synchronization statistics"""
@@ -392,22 +525,54 @@ class LeadSyncService:
 
 def sync_leads():
     """Main function to sync leads from Zoho CRM to local database"""
-    return asyncio.run(async_sync_leads())
+    return asyncio.run(_sync_leads_standalone())
+
+async def _sync_leads_standalone():
+    """Run one sync on a private event loop and close the mail client before the loop ends"""
+    try:
+        return await async_sync_leads()
+    finally:
+        await get_mail_service().close()
 
 async def async_sync_leads():
     """Async version of sync leads with email notifications"""
     sync_service = LeadSyncService()
     
+    # The Zoho SDK (used for lead status updates) is usually initialized at startup; a first
+    # init does file I/O and may wait on the initializer lock, so keep it off the event loop
+    try:
+        await run_blocking(initialize_sdk)
+    except Exception as e:
+        logger.error(f"Error initializing Zoho SDK: {e}")
+    
     try:
         logger.info("Starting lead synchronization...")
         
-        # Fetch leads from Zoho CRM
-        records = sync_service.fetch_leads_from_zoho()
+        async def save_batch(batch: List[Dict]) -> None:
+            # Each batch commits on its own; a failed one is already recorded in
+            # sync_stats['errors'] by save_to_local_db, and must not stop the later
+            # batches or the cold emails for new leads that were already committed
+            try:
+                await run_blocking(sync_service.save_to_local_db, batch)
+            except Exception:
+                logger.warning(f"Skipping failed batch of {len(batch)} leads")
         
-        if records:
-            # Save to local database
-            sync_service.save_to_local_db(records)
-            
+        # Stream leads from Zoho CRM into the local database in batches, so only
+        # one batch is held in memory (psycopg2 is blocking, keep it off the event loop)
+        fetched = 0
+        batch = []
+        # aclosing() shuts the generator (and its Zoho client) down if the loop exits early
+        async with contextlib.aclosing(sync_service.iter_leads_from_zoho()) as leads:
+            async for record in leads:
+                batch.append(record)
+                fetched += 1
+                if len(batch) >= DB_BATCH_SIZE:
+                    await save_batch(batch)
+                    batch = []
+        if batch:
+            await save_batch(batch)
+        
+        if fetched:
             # Send email notifications for new leads
             # await sync_service.send_new_lead_notifications()
             
@@ -416,8 +581,17 @@ async def async_sync_leads():
             if not new_leads:
                 logger.info("No new leads to send cold emails")
             else:
-                for new_lead in new_leads:
-                    await sync_service.send_cold_mail_to_new_lead(new_lead)
+                # Dispatch all cold emails concurrently; MailService bounds the in-flight sends
+                results = await asyncio.gather(
+                    *[sync_service.send_cold_mail_to_new_lead(new_lead) for new_lead in new_leads],
+                    return_exceptions=True
+                )
+                
+                for new_lead, result in zip(new_leads, results):
+                    if isinstance(result, Exception):
+                        error_msg = f"Error sending cold email to lead {new_lead.get('id', '')}: {result}"
+                        logger.error(error_msg)
+                        sync_service.sync_stats['errors'].append(error_msg)
             
             # Send sync summary email
             await sync_service.send_sync_summary_email()